@@ -11,6 +11,8 @@ STORES = {
 # Intervals
 DEFAULT_INTERVAL = 15
 MIN_INTERVAL = 5
+STOCK_CACHE_TTL = 5  # Seconds a successful stock check is reused
+STOCK_CACHE_MAXSIZE = 512  # Products kept in each stock-check cache
 
 # Window size
 WINDOW_SIZE = (1200, 800)
@@ -212,7 +212,7 @@ class ProductMonitor(BaseMonitor):
         self, is_available: bool, product_name: str, status_details: Dict
     ):
         """Handle the stock status response."""
-        self.log_status(status_details)
+        self.log_status(status_details, product_name)
         self.update_status_label(status_details)
 
         if is_available and self.status["last_status"] != is_available:
@@ -279,13 +279,17 @@ class ProductMonitor(BaseMonitor):
         except Exception as e:
             self.log_error(f"Error during cleanup: {str(e)}")
 
-    def log_status(self, status_details: Dict):
-        """Log the current stock status."""
+    def log_status(self, status_details: Dict, product_name: str = None):
+        """Log the current stock status.
+
+        check_stock results carry only status and stock, so the name comes
+        from the caller and purchasability may be unknown.
+        """
         status_text = (
-            f"Name: {status_details['name']}\n"
+            f"Name: {product_name or status_details.get('name', 'Unknown')}\n"
             f"Stock: {status_details['stock']} units\n"
             f"Status: {status_details['status']}\n"
-            f"Purchasable: {status_details['purchasable']}"
+            f"Purchasable: {status_details.get('purchasable', 'Unknown')}"
         )
         self.log_message(f"📊 Stock Status:\n{status_text}")
 
@@ -3,7 +3,7 @@ from .base_monitor import BaseMonitor
 import tkinter as tk
 from tkinter import ttk
 from ..config.constants import DEFAULT_INTERVAL, MIN_INTERVAL
-from ..utils.helpers import check_stock, parse_url
+from ..utils.helpers import check_stock, check_stock_many, parse_url
 from plyer import notification
 from datetime import datetime
 
@@ -303,6 +303,7 @@ class TaskMonitor(BaseMonitor):
             total_products = len(self.product_tree.get_children())
             checked_products = 0
             active_products = False  # Track if any products still need monitoring
+            pending = []  # (item, url, product_id) for products to check
 
             for item in self.product_tree.get_children():
                 values = self.product_tree.item(item)["values"]
@@ -317,8 +318,19 @@ class TaskMonitor(BaseMonitor):
                 self.log_message(f"Checking product: {url}")
 
                 try:
-                    product_id = parse_url(url)
-                    success, name, result = check_stock(product_id)
+                    pending.append((item, url, parse_url(url)))
+                except Exception as e:
+                    self.report_check_error(item, url, e)
+
+            # Fetch every product at once, then update the tree in order
+            results = check_stock_many([product_id for _, _, product_id in pending])
+            for (item, url, _), outcome in zip(pending, results):
+                if isinstance(outcome, Exception):
+                    self.report_check_error(item, url, outcome)
+                    continue
+
+                try:
+                    success, name, result = outcome
                     checked_products += 1
 
                     if success and result:
@@ -356,8 +368,7 @@ class TaskMonitor(BaseMonitor):
                         self.update_product_status(item, "Error Loading", url, "0")
 
                 except Exception as e:
-                    self.log_message(f"❌ Error checking {url}: {str(e)}")
-                    self.update_product_status(item, "Error", url, "0")
+                    self.report_check_error(item, url, e)
 
             # If all products are found in stock, stop the task
             if not active_products:
@@ -377,6 +388,11 @@ class TaskMonitor(BaseMonitor):
                 interval = self.validate_interval() * 1000
                 self.scheduled_check = self.after(interval, self.monitor_products)
 
+    def report_check_error(self, item, url, error: Exception):
+        """Log a failed product check and mark its row as errored."""
+        self.log_message(f"❌ Error checking {url}: {str(error)}")
+        self.update_product_status(item, "Error", url, "0")
+
     def update_product_status(self, item, name, url, stock):
         """Update the status of a product in the tree view."""
         try:
@@ -740,14 +740,10 @@ class StockMonitorGUI:
 
     def check_stock(self, url: str):
         """Check stock status for a product URL."""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-
         try:
-            from ..utils.helpers import check_stock
+            from ..utils.helpers import check_stock, parse_url
 
-            return check_stock(url, headers)
+            return check_stock(parse_url(url))
         except Exception as e:
             self.handle_error(e, "Stock Check Error")
             return False, "Error checking stock", None
@@ -78,15 +78,35 @@ class ProfileManager:
             if interval < 0:
                 raise ValidationError("Interval cannot be negative")
 
+    def _read(self, path: Path) -> dict:
+        """Read a profile file."""
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _write(self, path: Path, data: dict):
+        """Write a profile file."""
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+    def _list(self) -> list:
+        """List the stored profile files."""
+        if not self.profiles_dir.exists():
+            return []
+        return list(self.profiles_dir.glob("*.json"))
+
+    def _delete(self, path: Path) -> bool:
+        """Delete a profile file, returning False if it does not exist."""
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
     def list_profiles(self) -> list:
         """Get list of profile names."""
         try:
-            profiles = []
-            if self.profiles_dir.exists():
-                for file in self.profiles_dir.glob("*.json"):
-                    # Remove .json extension
-                    profiles.append(file.stem)
-            return sorted(profiles)
+            # Remove .json extension
+            return sorted(path.stem for path in self._list())
         except Exception as e:
             logging.error(f"Failed to list profiles: {str(e)}")
             return []
@@ -113,8 +133,7 @@ class ProfileManager:
 
             # Save to file
             file_path = self.profiles_dir / f"{name}.json"
-            with open(file_path, "w") as f:
-                json.dump(save_data, f, indent=4)
+            self._write(file_path, save_data)
 
             logging.info(f"Successfully saved profile: {name}")
             return True
@@ -127,12 +146,11 @@ class ProfileManager:
         """Load profile data from file."""
         try:
             filepath = self.profiles_dir / f"{name}.json"
-            if not filepath.exists():
+            try:
+                data = self._read(filepath)
+            except FileNotFoundError:
                 raise ProfileLoadError(f"Profile not found: {name}")
 
-            with open(filepath, "r") as f:
-                data = json.load(f)
-
             # Ensure interval is present in loaded data
             if "interval" not in data:
                 data["interval"] = DEFAULT_INTERVAL
@@ -151,8 +169,7 @@ class ProfileManager:
             )
 
             filepath = self.profiles_dir / f"{name}.json"
-            if filepath.exists():
-                filepath.unlink()
+            if self._delete(filepath):
                 log_security_event(
                     "PROFILE_DELETE", f"Successfully deleted profile: {name}"
                 )
@@ -1,27 +1,54 @@
 import os
 import json
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
-from typing import Dict, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional
 from ..utils.exceptions import APIError, URLParseError
 import re
 from urllib.error import URLError
 from bs4 import BeautifulSoup
+import threading
 import time
 import logging
 from ..api.bestbuy import BestBuyAPI
-from ..config.constants import USER_AGENT, API_URL
+from ..config.constants import (
+    USER_AGENT,
+    API_URL,
+    STOCK_CACHE_MAXSIZE,
+    STOCK_CACHE_TTL,
+)
 from ..utils.logger import log_security_event
 from urllib.parse import urlparse
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize data to indented JSON bytes."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
 # Configure logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+# Product pages look like /<locale>/product/<id>
+_PRODUCT_PATH_RE = re.compile(r".+/product/([^/]+)")
+
 
 def parse_url(url: str) -> str:
     """Extract product ID from Best Buy URL.
@@ -35,33 +62,40 @@ def parse_url(url: str) -> str:
     Raises:
         URLParseError: If URL is invalid or product ID cannot be extracted
     """
+    if not isinstance(url, str):
+        log_security_event("URL_ERROR", f"Error parsing URL {url!r}: not a string")
+        raise URLParseError("Could not extract product ID: URL must be a string")
+
     try:
-        parsed = urlparse(url)
-        if not parsed.scheme:
-            raise URLParseError("Could not extract product ID: Invalid URL scheme")
+        product_id = _extract_product_id(url)
+    except ValueError as e:
+        log_security_event("URL_ERROR", f"Error parsing URL {url}: {str(e)}")
+        raise URLParseError(f"Could not extract product ID: {str(e)}")
 
-        # Extract product ID from path
-        path_parts = parsed.path.strip("/").split("/")
-        if len(path_parts) < 3 or path_parts[-2] != "product":
-            raise URLParseError("Could not extract product ID: No product ID found")
+    log_security_event("URL_PARSE", f"Successfully extracted product ID: {product_id}")
+    return product_id
 
-        product_id = path_parts[-1]
-        if not product_id:
-            raise URLParseError("Could not extract product ID: No product ID found")
 
-        log_security_event(
-            "URL_PARSE", f"Successfully extracted product ID: {product_id}"
-        )
-        return product_id
+@lru_cache(maxsize=1024)
+def _extract_product_id(url: str) -> str:
+    """Parse the product ID out of a URL; memoized, failures are not cached."""
+    parsed = urlparse(url)
+    if not parsed.scheme:
+        raise URLParseError("Could not extract product ID: Invalid URL scheme")
 
-    except URLParseError:
-        raise
-    except Exception as e:
-        log_security_event("URL_ERROR", f"Error parsing URL {url}: {str(e)}")
-        raise URLParseError(f"Could not extract product ID: {str(e)}")
+    # Extract product ID from path
+    match = _PRODUCT_PATH_RE.fullmatch(parsed.path.strip("/"))
+    if not match:
+        raise URLParseError("Could not extract product ID: No product ID found")
+
+    return match.group(1)
+
+
+parse_url.cache_clear = _extract_product_id.cache_clear
+parse_url.cache_info = _extract_product_id.cache_info
 
 
-def create_session() -> requests.Session:
+def create_session(pool_maxsize: int = DEFAULT_POOLSIZE) -> requests.Session:
     """Create a requests session with retry logic and security headers."""
     session = requests.Session()
 
@@ -74,7 +108,7 @@ def create_session() -> requests.Session:
     )
 
     # Add retry strategy to session
-    adapter = HTTPAdapter(max_retries=retries)
+    adapter = HTTPAdapter(max_retries=retries, pool_maxsize=pool_maxsize)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
@@ -96,49 +130,225 @@ def create_session() -> requests.Session:
     return session
 
 
+# Shared by check_stock so repeated polls reuse pooled keep-alive connections.
+# The pool is sized for check_stock_many's workers, and the availability API
+# answers in JSON; retries and the other headers follow create_session.
+_SESSION = create_session(pool_maxsize=32)
+_SESSION.headers["Accept"] = "application/json"
+
+
+_AVAILABILITY_URL = API_URL + "/%s/availability"
+
+
+@dataclass(frozen=True)
+class StockStatus:
+    """Immutable availability details returned by check_stock.
+
+    Supports read-only mapping access (``info["stock"]``, ``info.get(...)``)
+    so existing dict consumers keep working.
+    """
+
+    __slots__ = ("status", "stock")
+
+    status: str
+    stock: int
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    # Frozen dataclasses with __slots__ cannot restore state through the
+    # default setattr path, which copy and pickle rely on
+    def __getstate__(self) -> Tuple[str, int]:
+        return self.status, self.stock
+
+    def __setstate__(self, state: Tuple[str, int]) -> None:
+        object.__setattr__(self, "status", state[0])
+        object.__setattr__(self, "stock", state[1])
+
+    def asdict(self) -> Dict[str, Any]:
+        """Return the details as a plain dict, e.g. for JSON serialization."""
+        return {"status": self.status, "stock": self.stock}
+
+
+# product_id -> (monotonic time fetched, check_stock result), oldest first
+_stock_cache: Dict[str, Tuple[float, Tuple[bool, str, StockStatus]]] = OrderedDict()
+_stock_cache_lock = threading.Lock()
+
+# product_id -> (ETag, check_stock result) for conditional re-fetches, oldest first
+_etag_cache: Dict[str, Tuple[str, Tuple[bool, str, StockStatus]]] = OrderedDict()
+
+# product_id -> Future for a fetch already in flight, shared by late callers
+_inflight: Dict[str, Future] = {}
+
+
+def _cache_put(cache: OrderedDict, key: str, value: Tuple) -> None:
+    """Store an entry, evicting the oldest past STOCK_CACHE_MAXSIZE.
+
+    Callers must hold _stock_cache_lock.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > STOCK_CACHE_MAXSIZE:
+        cache.popitem(last=False)
+
+
 def check_stock(
     product_id: str, headers: Optional[Dict] = None
-) -> Tuple[bool, str, Dict]:
-    """Check stock status for a product."""
+) -> Tuple[bool, str, StockStatus]:
+    """Check stock status for a product.
+
+    The shared session already sends the User-Agent and Accept headers;
+    ``headers`` is only needed to override or add to them.
+
+    Successful results are reused for STOCK_CACHE_TTL seconds, so repeated
+    checks of the same product in quick succession share one request. Calls
+    made while that request is still in flight wait for it instead of
+    sending their own. Calls with override ``headers`` always send their own
+    request, since the cached result was fetched without them.
+    """
+    if headers:
+        return _fetch_stock(product_id, headers)
+
+    with _stock_cache_lock:
+        cached = _stock_cache.get(product_id)
+        if cached:
+            if time.monotonic() - cached[0] < STOCK_CACHE_TTL:
+                return cached[1]
+            del _stock_cache[product_id]  # Expired
+        future = _inflight.get(product_id)
+        leader = future is None
+        if leader:
+            future = _inflight[product_id] = Future()
+
+    if not leader:
+        return future.result()
+
+    try:
+        result = _fetch_stock(product_id, headers)
+    except BaseException as e:
+        with _stock_cache_lock:
+            del _inflight[product_id]
+        future.set_exception(e)
+        raise
+
+    with _stock_cache_lock:
+        _cache_put(_stock_cache, product_id, (time.monotonic(), result))
+        del _inflight[product_id]
+    future.set_result(result)
+    return result
+
+
+def _clear_stock_caches():
+    """Forget cached results and ETags for every product."""
+    with _stock_cache_lock:
+        _stock_cache.clear()
+        _etag_cache.clear()
+
+
+check_stock.cache_clear = _clear_stock_caches
+
+
+def _fetch_stock(
+    product_id: str, headers: Optional[Dict]
+) -> Tuple[bool, str, StockStatus]:
+    """Request a product's availability from the API."""
     try:
-        url = f"{API_URL}/{product_id}/availability"
-        response = requests.get(url, headers=headers)
+        url = _AVAILABILITY_URL % product_id
+        with _stock_cache_lock:
+            known = _etag_cache.get(product_id)
+        if known:
+            headers = {**(headers or {}), "If-None-Match": known[0]}
+
+        response = _SESSION.get(url, headers=headers, timeout=(3, 5))
+        if known and response.status_code == 304:
+            return known[1]
         response.raise_for_status()
 
-        data = response.json()
-        return (
+        data = _json_loads(response.content)
+        availability = data["availability"]
+        result = (
             True,
             data["name"],
-            {
-                "status": data["availability"]["onlineAvailability"],
-                "stock": data["availability"].get("onlineAvailabilityCount", 0),
-            },
+            StockStatus(
+                availability["onlineAvailability"],
+                availability.get("onlineAvailabilityCount", 0),
+            ),
         )
+
+        etag = response.headers.get("ETag")
+        if etag:
+            with _stock_cache_lock:
+                _cache_put(_etag_cache, product_id, (etag, result))
+        return result
     except requests.exceptions.RequestException as e:
-        logging.error(f"Error checking product {product_id}: {str(e)}")
+        logger.warning("Error checking product %s: %s", product_id, e)
         raise APIError(str(e))
+    except (ValueError, KeyError) as e:
+        # Undecodable body or a payload missing the availability fields
+        logger.warning("Invalid availability response for %s: %r", product_id, e)
+        raise APIError(f"Invalid response: {e!r}")
+
+
+def check_stock_many(
+    product_ids: List[str], headers: Optional[Dict] = None, max_workers: int = 8
+) -> List[Any]:
+    """Check stock for several products concurrently.
+
+    Returns one entry per product ID, in order: the check_stock result tuple,
+    or the exception raised while checking that product.
+    """
+    if not product_ids:
+        return []
+
+    def check(product_id):
+        try:
+            return check_stock(product_id, headers)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(product_ids))) as pool:
+        return list(pool.map(check, product_ids))
 
 
 def save_profile(filename: str, profile_data: Dict) -> bool:
-    """Save profile data to file."""
+    """Save profile data to file, creating its directory if it is missing."""
     try:
-        os.makedirs("profiles", exist_ok=True)
-        with open(filename, "w") as f:
-            json.dump(profile_data, f, indent=4)
+        data = _json_dumps(profile_data)
+        try:
+            f = open(filename, "wb")
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            f = open(filename, "wb")
+        with f:
+            f.write(data)
         return True
-    except Exception:
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("Could not save profile %s: %s", filename, e)
         return False
 
 
 def load_profile(filename: str) -> Dict:
     """Load profile data from file."""
     try:
-        with open(filename, "r") as f:
-            return json.load(f)
-    except Exception:
+        with open(filename, "rb") as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError) as e:
+        logger.warning("Could not load profile %s: %s", filename, e)
         return None
 
 
 def get_timestamp() -> str:
     """Get current timestamp in standard format."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    t = time.localtime()
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+        f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+    )
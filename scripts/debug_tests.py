@@ -18,6 +18,7 @@ def run_debug_tests():
         "--tb=long",  # Detailed traceback
         "-x",  # Exit on first failure
         "--pdb",  # Drop into debugger on failures
+        "-n0",  # Run in-process; --pdb does not work with xdist workers
         "--cov=reup",  # Coverage for reup package
         "--cov-report=term-missing",  # Show missing coverage
     ]
@@ -19,12 +19,15 @@ setup(
         ],
     },
     extras_require={
+        "fast": ["orjson>=3.8.0"],
         "test": [
             "pytest>=6.0",
             "pytest-cov>=4.1.0",
             "pytest-timeout>=2.1.0",
             "pytest-mock>=3.10.0",
             "pytest-asyncio>=0.21.0",
+            "pytest-xdist>=3.0.0",
+            "responses>=0.23.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
         ]
@@ -1,7 +1,7 @@
 from reup.core.base_monitor import BaseMonitor
 
 
-class TestMonitor(BaseMonitor):
+class _TestMonitor(BaseMonitor):
     """Concrete implementation of BaseMonitor for testing."""
 
     def __init__(self, parent, main_app):
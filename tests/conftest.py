@@ -1,16 +1,29 @@
+import copy
 import pytest
+import responses
+from contextlib import ExitStack
 from pathlib import Path
 import sys
-import tkinter as tk
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import MagicMock, patch
-from tests.test_helpers import TestMonitor
+from tests._support.monitor import _TestMonitor
 
 # Add project root to Python path for tests
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-# Import from reup package
-from reup.gui.main_window import StockMonitorGUI
+# Import from reup package. main_window must be imported here, before the root
+# fixture swaps tkinter.ttk for a mock, so the GUI module binds the real ttk.
+import reup.gui.main_window  # noqa: F401
+from reup.managers.profile_manager import ProfileManager
+from reup.utils import helpers
+
+_real_check_stock = helpers.check_stock
+
+
+def _offline_check_stock(*args, **kwargs):
+    """Stand-in for helpers.check_stock that never touches the network."""
+    return True, "Test Product", helpers.StockStatus("InStock", 5)
 
 
 class MockVariable:
@@ -236,6 +249,51 @@ class MockTreeview(MockWidget):
         self._headings[column_id].update(kw)
 
 
+class FakeTree:
+    """Dict-backed stand-in for the product Treeview.
+
+    Rows are keyed by item id and hold the five column values; ``url_index``
+    maps each URL (second column) to its item id, and inserting a row whose
+    URL is already present is ignored.
+    """
+
+    EMPTY_ROW = ("", "", "", "", "")
+
+    def __init__(self):
+        self.items = {}
+        self.url_index = {}
+
+    def get_children(self, item=None):
+        return list(self.items)
+
+    def item(self, item_id, **kw):
+        if "values" in kw:
+            old = self.items.get(item_id)
+            if old is not None:
+                self.url_index.pop(old[1], None)
+            self.items[item_id] = tuple(kw["values"])
+            self.url_index[self.items[item_id][1]] = item_id
+        return {"values": self.items.get(item_id, self.EMPTY_ROW)}
+
+    def insert(self, parent, index, values=EMPTY_ROW, **kw):
+        url = values[1]
+        if url in self.url_index:  # Duplicate URL
+            return None
+        item_id = f"item{len(self.items) + 1}"
+        self.items[item_id] = tuple(values)
+        self.url_index[url] = item_id
+        return item_id
+
+    def delete(self, *items):
+        for item_id in items:
+            values = self.items.pop(item_id, None)
+            if values is not None:
+                self.url_index.pop(values[1], None)
+
+    def set(self, item_id, column=None, value=None):
+        pass
+
+
 class MockNotebook(MockWidget):
     """Mock Notebook widget."""
 
@@ -311,7 +369,7 @@ class MockText(MockWidget):
         return self._mark
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_ttk():
     """Create mock ttk components."""
     mock = MagicMock()
@@ -347,12 +405,14 @@ def mock_ttk():
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_tk():
     """Mock Tk and ttk to avoid actual window creation."""
-    with patch("tkinter.Tk") as mock_tk, patch(
-        "tkinter.ttk.Notebook"
-    ) as mock_notebook, patch("tkinter.ttk.Frame") as mock_frame:
+    with ExitStack() as stack:
+        mock_tk, mock_notebook, mock_frame = (
+            stack.enter_context(patch(target))
+            for target in ("tkinter.Tk", "tkinter.ttk.Notebook", "tkinter.ttk.Frame")
+        )
 
         # Add after_cancel method to mock
         mock_tk.after_cancel = MagicMock()
@@ -361,57 +421,242 @@ def mock_tk():
         yield {"tk": mock_tk, "notebook": mock_notebook, "frame": mock_frame}
 
 
+@pytest.fixture(scope="module")
+def root(mock_tk, mock_ttk):
+    """Create a mock root window shared by every test in the module."""
+    with pytest.MonkeyPatch.context() as mp:
+        # Mock tkinter internals
+        mp.setattr("tkinter.Tk", mock_tk["tk"])
+        mp.setattr("tkinter.ttk", mock_ttk)
+        mp.setattr("tkinter._default_root", None)
+        mp.setattr("tkinter._support_default_root", True)
+        mp.setattr("tkinter.StringVar", mock_tk["tk"].StringVar)
+
+        # Create root and set as default
+        root = mock_tk["tk"]
+        mp.setattr("tkinter._default_root", root)
+        yield root
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_network():
+    """Keep every test off the network by stubbing check_stock once."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(helpers, "check_stock", _offline_check_stock)
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _silence_messagebox(monkeypatch):
+    """Answer every message box immediately instead of opening a dialog."""
+    import tkinter.messagebox as mb
+
+    monkeypatch.setattr(mb, "askyesno", lambda *args, **kwargs: True)
+    for name in ("showinfo", "showwarning", "showerror"):
+        monkeypatch.setattr(mb, name, lambda *args, **kwargs: None)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def frozen_timestamp():
+    """Freeze the timestamp monitors prefix to log lines."""
+    timestamp = "2024-02-20 12:00:00"
+    with patch("reup.core.base_monitor.get_timestamp", return_value=timestamp):
+        yield timestamp
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _mock_plyer():
+    """Patch desktop notifications once so no test raises a real one."""
+    with patch("plyer.notification.notify") as notify:
+        yield notify
+
+
+@pytest.fixture(autouse=True)
+def mock_notify(_mock_plyer):
+    """The session's notify mock, with calls and side effects cleared."""
+    _mock_plyer.reset_mock(return_value=True, side_effect=True)
+    return _mock_plyer
+
+
+@pytest.fixture(autouse=True)
+def http():
+    """Intercept HTTP for every test; register responses on the returned mock.
+
+    Requests to unregistered URLs raise ConnectionError, so no test can reach
+    the network by accident.
+    """
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
+
+
+@pytest.fixture(autouse=True)
+def _clear_stock_cache():
+    """Start every test with an empty check_stock result cache."""
+    _real_check_stock.cache_clear()
+
+
 @pytest.fixture
-def root(monkeypatch, mock_tk, mock_ttk):
-    """Create a mock root window for testing."""
-    # Mock tkinter internals
-    monkeypatch.setattr("tkinter.Tk", mock_tk["tk"])
-    monkeypatch.setattr("tkinter.ttk", mock_ttk)
-    monkeypatch.setattr("tkinter._default_root", None)
-    monkeypatch.setattr("tkinter._support_default_root", True)
-    monkeypatch.setattr("tkinter.StringVar", mock_tk["tk"].StringVar)
-    monkeypatch.setattr("tkinter.messagebox.Message", MagicMock())
-
-    # Create root and set as default
-    root = mock_tk["tk"]
-    monkeypatch.setattr("tkinter._default_root", root)
-    return root
+def live_check_stock(monkeypatch):
+    """Restore the real check_stock for tests that stub HTTP responses instead."""
+    monkeypatch.setattr(helpers, "check_stock", _real_check_stock)
+    return _real_check_stock
+
+
+_PROFILE_IO = ("_read", "_write", "_list", "_delete")
+_real_profile_io = {name: getattr(ProfileManager, name) for name in _PROFILE_IO}
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _mem_profile_store():
+    """Keep ProfileManager files in a per-module dict instead of on disk."""
+    store = {}
+
+    def read(self, path):
+        try:
+            return copy.deepcopy(store[path])
+        except KeyError:
+            raise FileNotFoundError(path)
+
+    def write(self, path, data):
+        store[path] = copy.deepcopy(data)
+
+    def list_files(self):
+        return [path for path in store if path.parent == self.profiles_dir]
+
+    def delete(self, path):
+        return store.pop(path, None) is not None
+
+    fakes = {"_read": read, "_write": write, "_list": list_files, "_delete": delete}
+    with pytest.MonkeyPatch.context() as mp:
+        for name, fake in fakes.items():
+            mp.setattr(ProfileManager, name, fake)
+        yield store
 
 
 @pytest.fixture
+def disk_profiles(monkeypatch):
+    """Restore real file I/O for tests that cover profile serialization."""
+    for name, real in _real_profile_io.items():
+        monkeypatch.setattr(ProfileManager, name, real)
+
+
+def _frozen(value):
+    """Recursively turn dicts into read-only proxies and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _frozen(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+@pytest.fixture(scope="session")
 def mock_api():
-    """Mock API responses for testing."""
-    return {
-        "products": [
-            {
-                "name": "Test Product",
-                "regularPrice": 99.99,
-                "sku": "12345",
-                "thumbnailImage": "http://example.com/image.jpg",
-                "availability": {
-                    "isAvailableOnline": True,
-                    "onlineAvailability": "InStock",
-                    "onlineAvailabilityCount": 5,
-                    "buttonState": "AddToCart",
-                },
-            }
-        ]
-    }
+    """Mock API responses for testing.
+
+    Shared by the whole session, so the data is read-only; tests that need a
+    variant must build their own copy.
+    """
+    return _frozen(
+        {
+            "products": [
+                {
+                    "name": "Test Product",
+                    "regularPrice": 99.99,
+                    "sku": "12345",
+                    "thumbnailImage": "http://example.com/image.jpg",
+                    "availability": {
+                        "isAvailableOnline": True,
+                        "onlineAvailability": "InStock",
+                        "onlineAvailabilityCount": 5,
+                        "buttonState": "AddToCart",
+                    },
+                }
+            ]
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def app(root, mock_ttk):
+    """Create a test instance of the main application shared by the module.
+
+    Building the GUI is the most expensive part of these tests, so it happens
+    once per module; ``_reset_app`` restores its state between tests.
+    """
+    from reup.gui.main_window import StockMonitorGUI
+
+    with pytest.MonkeyPatch.context() as mp:
+        # Mock ttk.Style before creating app
+        mp.setattr("tkinter.ttk.Style", mock_ttk.Style)
+
+        with patch("tkinter._get_default_root", return_value=root):
+            app = StockMonitorGUI(root)
+        yield app
+
+
+@pytest.fixture(autouse=True)
+def _reset_app(request):
+    """Restore the shared app to its post-construction state after each test."""
+    if "app" not in request.fixturenames:
+        yield
+        return
+
+    app = request.getfixturevalue("app")
+    saved = dict(vars(app))
+    yield
+    vars(app).clear()
+    vars(app).update(saved)
+    app.monitor_tabs.clear()
+    app.product_tree.delete(*app.product_tree.get_children())
 
 
 @pytest.fixture
-def app(root, monkeypatch, mock_ttk):
-    """Create a test instance of the main application."""
-    # Mock ttk.Style before creating app
-    monkeypatch.setattr("tkinter.ttk.Style", mock_ttk.Style)
+def gui_mocks(app, monkeypatch):
+    """Replace the app's widgets and callbacks with mocks for one test."""
+    mocks = {
+        "notebook": MagicMock(),
+        "product_tree": MagicMock(),
+        "monitor_tabs": {},
+        "handle_error": MagicMock(),
+        "style": MagicMock(),
+        "log_message": MagicMock(),
+    }
+    for name, mock in mocks.items():
+        monkeypatch.setattr(app, name, mock, raising=False)
+    return SimpleNamespace(**mocks)
 
-    from reup.gui.main_window import StockMonitorGUI
 
-    with patch("tkinter._get_default_root", return_value=root):
-        app = StockMonitorGUI(root)
+@pytest.fixture
+def mocked_app(app, gui_mocks):
+    """Return the app wired to mocks with an empty product tree."""
+    gui_mocks.product_tree.get_children.return_value = []
+    gui_mocks.product_tree.item.return_value = {"values": list(FakeTree.EMPTY_ROW)}
+    gui_mocks.product_tree.insert.return_value = "item1"
+    gui_mocks.notebook.index.return_value = 1
     return app
 
 
+@pytest.fixture
+def fake_tree():
+    """Provide an empty dict-backed product tree."""
+    return FakeTree()
+
+
+@pytest.fixture
+def mock_profile_handler(app, monkeypatch):
+    """Install a pre-configured ProfileHandler mock on the app."""
+    handler = MagicMock()
+    handler.load_profile.return_value = {
+        "products": [
+            {"name": "Test Product 1", "url": "https://example.com/1"},
+            {"name": "Test Product 2", "url": "https://example.com/2"},
+        ]
+    }
+    handler.list_profiles.return_value = ["test_profile"]
+    monkeypatch.setattr(app, "profile_handler", handler)
+    return handler
+
+
 @pytest.fixture
 def tmp_profiles_dir(tmp_path):
     """Create a temporary profiles directory."""
@@ -430,7 +675,7 @@ def mock_parent():
 
 @pytest.fixture
 def base_monitor(mock_parent):
-    monitor = TestMonitor(MagicMock(), mock_parent)
+    monitor = _TestMonitor(MagicMock(), mock_parent)
     monitor.log_display = MagicMock()
     return monitor
 
@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 import tkinter as tk
 from tkinter import ttk
 from reup.core.base_monitor import BaseMonitor
-from tests.test_helpers import TestMonitor  # Changed from relative to absolute import
+from tests._support.monitor import _TestMonitor
 
 
 @pytest.fixture
@@ -16,7 +16,7 @@ def mock_parent():
 
 @pytest.fixture
 def base_monitor(mock_parent):
-    monitor = TestMonitor(MagicMock(), mock_parent)
+    monitor = _TestMonitor(MagicMock(), mock_parent)
     monitor.log_display = MagicMock()
     return monitor
 
@@ -24,7 +24,7 @@ def base_monitor(mock_parent):
 def test_base_monitor_init(mock_parent):
     """Test BaseMonitor initialization."""
     parent = MagicMock()
-    monitor = TestMonitor(parent, mock_parent)
+    monitor = _TestMonitor(parent, mock_parent)
 
     assert monitor.main_app == mock_parent
     assert monitor.style == mock_parent.style
@@ -67,27 +67,24 @@ def test_update_status(base_monitor):
     base_monitor.status_label.config.assert_called_with(text="Status: Unknown")
 
 
-def test_log_message(base_monitor):
+def test_log_message(base_monitor, frozen_timestamp):
     """Test message logging."""
     test_message = "Test message"
-    timestamp = "2024-02-20 12:00:00"
 
     # Test with log_display
-    with patch("reup.core.base_monitor.get_timestamp", return_value=timestamp):
-        base_monitor.log_message(test_message)
+    base_monitor.log_message(test_message)
 
-        expected_log = f"{timestamp} {test_message}\n"
-        base_monitor.log_display.insert.assert_called_once_with("1.0", expected_log)
-        base_monitor.log_display.see.assert_called_once_with("1.0")
-        base_monitor.parent.log_message.assert_called_once_with(test_message)
+    expected_log = f"{frozen_timestamp} {test_message}\n"
+    base_monitor.log_display.insert.assert_called_once_with("1.0", expected_log)
+    base_monitor.log_display.see.assert_called_once_with("1.0")
+    base_monitor.parent.log_message.assert_called_once_with(test_message)
 
     # Test without log_display
     base_monitor.log_display = None
     base_monitor.parent.log_message.reset_mock()
 
-    with patch("reup.core.base_monitor.get_timestamp", return_value=timestamp):
-        base_monitor.log_message(test_message)
-        base_monitor.parent.log_message.assert_called_once_with(test_message)
+    base_monitor.log_message(test_message)
+    base_monitor.parent.log_message.assert_called_once_with(test_message)
 
 
 def test_abstract_method_implementations(base_monitor):
@@ -100,7 +97,7 @@ def test_abstract_method_implementations(base_monitor):
 
 def test_abstract_methods():
     """Test that abstract methods raise NotImplementedError."""
-    monitor = TestMonitor(MagicMock(), MagicMock())
+    monitor = _TestMonitor(MagicMock(), MagicMock())
 
     # Create a new class without implementing abstract methods
     class IncompleteMonitor(BaseMonitor):
@@ -1,8 +1,12 @@
 import pytest
 from reup.core.product_monitor import ProductMonitor
+from reup.utils import helpers as _helpers
 from reup.utils.exceptions import StockCheckError
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, call
 import requests
+from reup.config.constants import API_URL
+
+AVAILABILITY_URL = f"{API_URL}/12345/availability"
 
 
 def test_product_monitor_init(root, app, mock_tk):
@@ -37,7 +41,6 @@ def test_validate_interval(root, app, mock_tk):
     assert monitor.validate_interval() == 5  # Should return MIN_INTERVAL
 
 
-@pytest.mark.timeout(5)
 def test_check_stock(root, app, mock_api, monkeypatch, caplog):
     """Test stock checking functionality."""
     caplog.set_level("INFO")
@@ -66,35 +69,24 @@ def test_check_stock(root, app, mock_api, monkeypatch, caplog):
     monitor.update_status = MagicMock()
     monitor.last_check_status = None
 
+    product = mock_api["products"][0]
+    product_name = product["name"]
+    availability = product["availability"]
+
     # Create mock functions
     def mock_parse_url(url):
         print(f"mock_parse_url called with: {url}")
         return "12345"
 
-    # Mock response object
-    class MockResponse:
-        def __init__(self, json_data, status_code):
-            self.json_data = json_data
-            self.status_code = status_code
-
-        def json(self):
-            return self.json_data
-
-    def mock_requests_get(*args, **kwargs):
-        print(f"mock_requests_get called with: args={args}, kwargs={kwargs}")
-        return MockResponse(mock_api["products"][0], 200)
-
     def mock_check_stock(product_id):
         print(f"mock_check_stock called with: {product_id}")
         result = (
             True,
-            mock_api["products"][0]["name"],
+            product_name,
             {
-                "name": mock_api["products"][0]["name"],
-                "stock": mock_api["products"][0]["availability"][
-                    "onlineAvailabilityCount"
-                ],
-                "status": mock_api["products"][0]["availability"]["onlineAvailability"],
+                "name": product_name,
+                "stock": availability["onlineAvailabilityCount"],
+                "status": availability["onlineAvailability"],
                 "purchasable": "Yes",
             },
         )
@@ -105,13 +97,10 @@ def test_check_stock(root, app, mock_api, monkeypatch, caplog):
     print("Setting up mocks...")
     monkeypatch.setattr("logging.info", lambda x: print(f"log: {x}"))
     monkeypatch.setattr("logging.error", lambda x: print(f"error: {x}"))
-    monkeypatch.setattr("reup.utils.helpers.parse_url", mock_parse_url)
-    monkeypatch.setattr("requests.get", mock_requests_get)  # Mock requests.get
+    monkeypatch.setattr(_helpers, "parse_url", mock_parse_url)
 
     # Important: Mock at the correct import location
-    import reup.utils.helpers
-
-    monkeypatch.setattr(reup.utils.helpers, "check_stock", mock_check_stock)
+    monkeypatch.setattr(_helpers, "check_stock", mock_check_stock)
     print("Mocks set up")
 
     # Test successful stock check
@@ -130,10 +119,8 @@ def test_check_stock(root, app, mock_api, monkeypatch, caplog):
 
     print("Running assertions...")
     assert success
-    assert name == mock_api["products"][0]["name"]
-    assert (
-        info["status"] == mock_api["products"][0]["availability"]["onlineAvailability"]
-    )
+    assert name == product_name
+    assert info["status"] == availability["onlineAvailability"]
     print("Test completed successfully")
 
 
@@ -151,7 +138,7 @@ def test_error_handling(root, app, monkeypatch):
     def mock_parse_url(url):
         raise ValueError("Invalid URL")
 
-    monkeypatch.setattr("reup.utils.helpers.parse_url", mock_parse_url)
+    monkeypatch.setattr(_helpers, "parse_url", mock_parse_url)
 
     # Test invalid URL
     success, name, info = monitor.check_stock()
@@ -161,17 +148,14 @@ def test_error_handling(root, app, monkeypatch):
     assert "Error" in monitor.last_check_status
 
 
-def test_check_stock_api_error(root, mock_api, monkeypatch):
+def test_check_stock_api_error(root, mock_api, live_check_stock, http):
     """Test handling of API errors."""
     mock_app = MagicMock()
     monitor = ProductMonitor(
         root, "https://www.bestbuy.ca/en-ca/product/12345", mock_app, test_mode=True
     )
 
-    def mock_requests_get(*args, **kwargs):
-        raise requests.exceptions.RequestException("API Error")
-
-    monkeypatch.setattr("requests.get", mock_requests_get)
+    http.get(AVAILABILITY_URL, body=requests.exceptions.RequestException("API Error"))
 
     success, name, info = monitor.check_stock()
     assert not success
@@ -179,21 +163,14 @@ def test_check_stock_api_error(root, mock_api, monkeypatch):
     assert info is None
 
 
-def test_check_stock_invalid_response(root, mock_api, monkeypatch):
+def test_check_stock_invalid_response(root, mock_api, live_check_stock, http):
     """Test handling of invalid API responses."""
     mock_app = MagicMock()
     monitor = ProductMonitor(
         root, "https://www.bestbuy.ca/en-ca/product/12345", mock_app, test_mode=True
     )
 
-    class MockResponse:
-        def __init__(self):
-            self.status_code = 200
-
-        def json(self):
-            return {"invalid": "response"}
-
-    monkeypatch.setattr("requests.get", lambda *args, **kwargs: MockResponse())
+    http.get(AVAILABILITY_URL, json={"invalid": "response"})
 
     success, name, info = monitor.check_stock()
     assert not success
@@ -243,7 +220,11 @@ def test_monitor_lifecycle(root, mock_api, monkeypatch):
     monitor.toggle_pause()
     assert not monitor.paused
     monitor.pause_button.config.assert_called_with(text="⏸️ Pause")
-    monitor.status_label.config.assert_called_with(text="Status: Running")
+    # Resuming runs a check straight away, which then shows the stock status
+    assert monitor.status_label.config.call_args_list[-2:] == [
+        call(text="Status: Running"),
+        call(text="Status: InStock (5 units)"),
+    ]
 
     # Stop monitoring
     monitor.stop_monitoring()
@@ -251,17 +232,13 @@ def test_monitor_lifecycle(root, mock_api, monkeypatch):
     monitor.after_cancel.assert_called_with("after_id")
 
 
-def test_stock_notifications(root, mock_api, monkeypatch):
+def test_stock_notifications(root, mock_api, mock_notify):
     """Test stock availability notifications."""
     mock_app = MagicMock()
     monitor = ProductMonitor(
         root, "https://www.bestbuy.ca/en-ca/product/12345", mock_app, test_mode=True
     )
 
-    # Mock notification system
-    mock_notify = MagicMock()
-    monkeypatch.setattr("plyer.notification.notify", mock_notify)
-
     # Test notification when stock becomes available
     monitor.notify_stock_available("Test Product", 5)
     mock_notify.assert_called_once()
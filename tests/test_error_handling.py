@@ -3,9 +3,10 @@ from reup.utils.exceptions import APIError, URLError
 import requests
 from unittest.mock import MagicMock
 from reup.core.product_monitor import ProductMonitor
+from reup.config.constants import API_URL
 
 
-def test_api_errors(root, app, monkeypatch):
+def test_api_errors(root, app, live_check_stock, http):
     """Test handling of API errors."""
     # Create monitor in test mode
     monitor = ProductMonitor(
@@ -21,10 +22,10 @@ def test_api_errors(root, app, monkeypatch):
     monitor.status_label = MagicMock()
     monitor.after = MagicMock()
 
-    def mock_requests_get(*args, **kwargs):
-        raise requests.exceptions.RequestException("API Error")
-
-    monkeypatch.setattr("requests.get", mock_requests_get)
+    http.get(
+        f"{API_URL}/12345/availability",
+        body=requests.exceptions.RequestException("API Error"),
+    )
 
     # Test API error
     success, name, info = monitor.check_stock()
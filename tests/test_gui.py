@@ -1,217 +1,137 @@
 import pytest
-from unittest.mock import MagicMock, patch, mock_open
-import tkinter as tk
-import tkinter.ttk as ttk
-from reup.gui.main_window import StockMonitorGUI as MainApp
+from unittest.mock import MagicMock, create_autospec
 from reup.core.product_monitor import ProductMonitor
+from reup.gui import main_window as _mw
 from reup.utils.exceptions import APIError
-import json
-import os
-from pathlib import Path
+from reup.config.constants import API_URL
 
+pytestmark = pytest.mark.gui
 
-def test_add_product(root, app, mock_api, monkeypatch):
-    """Test adding a product to monitor."""
-    # Mock necessary components
-    app.notebook = MagicMock()
-    app.product_tree = MagicMock()
-    app.monitor_tabs = {}
-    app.handle_error = MagicMock()
-    app.style = MagicMock()
-    app.log_message = MagicMock()
-
-    # Mock tree methods with proper duplicate checking
-    tree_items = {}  # Store actual item values
-
-    def mock_get_children():
-        return list(tree_items.keys())
-
-    app.product_tree.get_children = mock_get_children
-
-    def mock_item(item_id):
-        return {"values": tree_items.get(item_id, ["", "", "", "", ""])}
-
-    app.product_tree.item = mock_item
-
-    def mock_insert(*args, **kwargs):
-        values = kwargs.get("values", ["", "", "", "", ""])
-        # Check for duplicate URL
-        for existing_values in tree_items.values():
-            if existing_values[1] == values[1]:  # Compare URLs
-                return None
-        item_id = f"item{len(tree_items) + 1}"
-        tree_items[item_id] = values
-        return item_id
-
-    app.product_tree.insert = MagicMock(side_effect=mock_insert)
-
-    # Mock add_product_to_monitor
-    def mock_add_product(url):
-        # Check for duplicates first
-        for item in app.product_tree.get_children():
-            values = app.product_tree.item(item)["values"]
-            if values[1] == url:
-                return None
-
-        # If not duplicate, create a simple mock monitor
-        monitor = MagicMock()
-        monitor.check_stock.return_value = (
-            True,
-            mock_api["products"][0]["name"],
-            {
-                "name": mock_api["products"][0]["name"],
-                "stock": 5,
-                "status": "InStock",
-                "purchasable": "Yes",
-            },
-        )
+PRODUCT_URL = "https://www.bestbuy.ca/en-ca/product/12345"
+PRODUCT_ID = PRODUCT_URL.rpartition("/")[2]
+TAB_NAME = f"Monitor_{PRODUCT_ID}"
 
-        # Add to tree
-        app.product_tree.insert(
-            "",
-            "end",
-            values=(
-                mock_api["products"][0]["name"],
-                url,
-                "Not Monitoring",
-                "▶",
-                "🛒 Add to Cart",
-            ),
-        )
-        return monitor
 
-    app.add_product_to_monitor = mock_add_product
+def _make_monitor(notebook, url, parent):
+    """Build a ProductMonitor stand-in without creating any widgets."""
+    monitor = create_autospec(ProductMonitor, instance=True)
+    monitor.notebook = notebook
+    monitor.url = url
+    monitor.parent = parent
+    monitor.main_app = parent
+    monitor.scheduled_check = None
+    monitor.validate_interval.return_value = 15
+    monitor.check_stock.return_value = (True, "Test Product", {})
+    return monitor
 
-    # Test adding a valid product
-    url = "https://www.bestbuy.ca/en-ca/product/12345"
-    monitor = app.add_product_to_monitor(url)
-    assert monitor is not None
-    assert len(tree_items) == 1
 
-    # Test adding duplicate product
-    monitor2 = app.add_product_to_monitor(url)
-    assert monitor2 is None
-    assert len(tree_items) == 1  # Should not add duplicate
+@pytest.fixture
+def add_product(app, gui_mocks, fake_tree, monkeypatch):
+    """Wire the real add_product_to_monitor to a fake tree and stub monitors."""
+    monkeypatch.setattr(app, "product_tree", fake_tree)
+    monkeypatch.setattr(_mw, "ProductMonitor", _make_monitor)
+    return app.add_product_to_monitor
 
 
-def test_profile_management(root, app, tmp_profiles_dir, monkeypatch):
-    """Test profile management functionality."""
-    # Mock necessary components
-    app.profile_handler = MagicMock()
-    app.profile_var = MagicMock()
-    app.profile_var.get.return_value = "test_profile"
+def test_add_product(add_product, fake_tree, gui_mocks):
+    """Test adding a product creates its monitor and a tree row."""
+    monitor = add_product(PRODUCT_URL)
 
-    # Mock product tree
-    app.product_tree = MagicMock()
-    app.product_tree.get_children.return_value = []
-    app.product_tree.item.return_value = {
-        "values": ["Test Product", "https://example.com/1"]
-    }
+    assert monitor.url == PRODUCT_URL
+    monitor.check_stock.assert_called_once_with()
+    assert list(fake_tree.items.values()) == [
+        ("Test Product", PRODUCT_URL, "Not Monitoring", "▶")
+    ]
+    gui_mocks.handle_error.assert_not_called()
+
+
+def test_add_product_error(add_product, fake_tree, gui_mocks, monkeypatch):
+    """Test a failing monitor is reported and adds no row."""
+    error = APIError("Not found")
+    monkeypatch.setattr(_mw, "ProductMonitor", MagicMock(side_effect=error))
 
-    # Mock clear_product_tree method
-    app.clear_product_tree = MagicMock()
+    assert add_product(PRODUCT_URL) is None
+    assert fake_tree.items == {}
+    gui_mocks.handle_error.assert_called_once_with(error, "Stock Check Error")
 
-    # Mock add_product_to_monitor
-    app.add_product_to_monitor = MagicMock()
 
-    # Mock handle_error
+@pytest.mark.parametrize("op", ["save", "load", "delete"])
+def test_profile_op(app, fake_tree, mock_profile_handler, op):
+    """Test saving, loading and deleting the selected profile."""
+    app.profile_var = MagicMock()
+    app.profile_var.get.return_value = "test_profile"
+    app.product_tree = fake_tree
     app.handle_error = MagicMock()
 
-    # Mock profile data
-    test_profile = {
-        "products": [
-            {"name": "Test Product 1", "url": "https://example.com/1"},
-            {"name": "Test Product 2", "url": "https://example.com/2"},
-        ]
-    }
+    if op == "save":
+        app.save_profile()
+        mock_profile_handler.save_profile.assert_called_once_with(
+            "test_profile", {"products": []}
+        )
+    elif op == "load":
+        app.clear_product_tree = MagicMock()
+        app.add_product_to_monitor = MagicMock()
+        test_profile = mock_profile_handler.load_profile.return_value
+
+        app.load_profile()
 
-    # Set up mock returns
-    app.profile_handler.load_profile.return_value = test_profile
+        mock_profile_handler.load_profile.assert_called_once_with("test_profile")
+        app.clear_product_tree.assert_called_once()
+        assert app.add_product_to_monitor.call_count == len(test_profile["products"])
+    else:
+        app.profile_manager = MagicMock()
+        app.update_profile_list = MagicMock()
 
-    # Test loading profile
-    app.load_profile()
+        app.delete_selected_profile()
+
+        app.profile_manager.delete_profile.assert_called_once_with("test_profile")
+        app.update_profile_list.assert_called_once()
 
-    # Verify the correct methods were called
     app.profile_var.get.assert_called_once()
-    app.profile_handler.load_profile.assert_called_once_with("test_profile")
-    app.clear_product_tree.assert_called_once()
-    assert app.add_product_to_monitor.call_count == len(test_profile["products"])
+    app.handle_error.assert_not_called()
 
 
-def test_monitor_tab_management(root, app, mock_api, monkeypatch):
+def test_monitor_tab_management(mocked_app):
     """Test monitor tab creation and removal."""
-    # Mock necessary components
-    app.notebook = MagicMock()
-    app.product_tree = MagicMock()
-    app.monitor_tabs = {}
-    app.handle_error = MagicMock()
-    app.style = MagicMock()
-    app.log_message = MagicMock()
-
-    # Mock check_stock function
-    class MockResponse:
-        def __init__(self):
-            self.status_code = 200
-
-        def json(self):
-            return mock_api["products"][0]
-
-    def mock_requests_get(*args, **kwargs):
-        return MockResponse()
-
-    monkeypatch.setattr("requests.get", mock_requests_get)
-
-    # Mock notebook methods
-    app.notebook.select = MagicMock()
-    app.notebook.forget = MagicMock()
-    app.notebook.add = MagicMock()
-    app.notebook.index = MagicMock(return_value=1)
-    app.notebook.tab = MagicMock()
-
-    # Mock tree methods
-    app.product_tree.get_children = MagicMock(return_value=[])
-    app.product_tree.item = MagicMock(return_value={"values": ["", "", "", "", ""]})
-    app.product_tree.insert = MagicMock(return_value="item1")
-
-    # Mock check_stock to avoid API calls
-    def mock_check_stock(*args):
-        return (
-            True,
-            mock_api["products"][0]["name"],
-            {
-                "name": mock_api["products"][0]["name"],
-                "stock": 5,
-                "status": "InStock",
-                "purchasable": "Yes",
-            },
-        )
-
-    monkeypatch.setattr("reup.utils.helpers.check_stock", mock_check_stock)
+    app = mocked_app
 
     # Test URL
-    url = "https://www.bestbuy.ca/en-ca/product/12345"
-    tab_name = f"Monitor_{url.split('/')[-1]}"
+    url = PRODUCT_URL
 
     # Add and start monitoring
     monitor = app.add_product_to_monitor(url)
     assert monitor is not None
 
     app.start_monitoring(url)
-    assert tab_name in app.monitor_tabs
+    assert TAB_NAME in app.monitor_tabs
     app.notebook.add.assert_called()
 
     # Stop monitoring
-    app.stop_monitoring(tab_name)
-    assert tab_name not in app.monitor_tabs
+    app.stop_monitoring(TAB_NAME)
+    assert TAB_NAME not in app.monitor_tabs
     app.notebook.forget.assert_called()
 
 
+def test_check_stock_by_url(app, gui_mocks, live_check_stock, http):
+    """Test the app resolves a product URL to its ID before checking stock."""
+    availability_url = f"{API_URL}/{PRODUCT_ID}/availability"
+    http.get(
+        availability_url,
+        json={
+            "name": "Test Product",
+            "availability": {"onlineAvailability": "InStock"},
+        },
+    )
+
+    success, name, info = app.check_stock(PRODUCT_URL)
+
+    assert (success, name, info.status) == (True, "Test Product", "InStock")
+    assert [c.request.url for c in http.calls] == [availability_url]
+    gui_mocks.handle_error.assert_not_called()
+
+
 def test_window_initialization(root, app):
     """Test window setup and component creation."""
-    # Mock the root window's title method
-    root.title = MagicMock(return_value="Reup")
-    app.root.title = MagicMock(return_value="Reup")
-
     # Mock product tree
     app.product_tree = MagicMock()
     app.product_tree.__getitem__.return_value = (
@@ -237,27 +157,28 @@ def test_window_initialization(root, app):
 
 def test_search_functionality(root, app, mock_api, monkeypatch):
     """Test product search and results handling."""
-    # Mock search entry and root
+    # Mock search entry (root is already a MagicMock)
     app.search_entry = MagicMock()
-    app.search_entry.get = MagicMock(return_value="test query")
-    app.root.config = MagicMock()
-    app.root.update = MagicMock()
+    app.search_entry.get.return_value = "test query"
 
     # Mock store selection
     app.store_var = MagicMock()
-    app.store_var.get = MagicMock(return_value="Best Buy")
+    app.store_var.get.return_value = "Best Buy"
 
     # Mock search manager
-    def mock_search(*args, **kwargs):
-        return [
-            {
-                "name": "Test Product",
-                "price": 99.99,
-                "url": "https://www.bestbuy.ca/en-ca/product/12345",
-            }
-        ]
-
-    app.search_manager.search_products = MagicMock(side_effect=mock_search)
+    monkeypatch.setattr(
+        app.search_manager,
+        "search_products",
+        MagicMock(
+            return_value=[
+                {
+                    "name": "Test Product",
+                    "price": 99.99,
+                    "url": PRODUCT_URL,
+                }
+            ]
+        ),
+    )
 
     # Mock display_search_results to avoid GUI operations
     app.display_search_results = MagicMock()
@@ -272,178 +193,39 @@ def test_search_functionality(root, app, mock_api, monkeypatch):
     app.display_search_results.assert_called_once()
 
     # Test error handling
-    app.search_manager.search_products = MagicMock(side_effect=APIError("Not found"))
+    monkeypatch.setattr(
+        app.search_manager,
+        "search_products",
+        MagicMock(side_effect=APIError("Not found")),
+    )
     app.handle_error = MagicMock()
     app.perform_search()
     app.handle_error.assert_called_once()
 
 
-@pytest.fixture
-def mock_tk_setup():
-    """Create a complete mock tkinter environment."""
-    with patch("tkinter.Tk") as mock_tk, patch(
-        "tkinter.ttk.Style"
-    ) as mock_style, patch("tkinter.ttk.Notebook") as mock_notebook, patch(
-        "tkinter.ttk.Frame"
-    ) as mock_frame, patch(
-        "tkinter.StringVar"
-    ) as mock_stringvar, patch(
-        "tkinter._default_root", create=True
-    ), patch(
-        "tkinter._support_default_root", True
-    ):
-
-        # Configure mock Tk
-        mock_tk_instance = mock_tk.return_value
-        mock_tk_instance.title = MagicMock()
-        mock_tk_instance.geometry = MagicMock()
-        mock_tk_instance.minsize = MagicMock()
-        mock_tk_instance.grid_rowconfigure = MagicMock()
-        mock_tk_instance.grid_columnconfigure = MagicMock()
-        mock_tk_instance.winfo_toplevel = MagicMock(return_value=mock_tk_instance)
-
-        # Configure mock StringVar
-        mock_stringvar_instance = mock_stringvar.return_value
-        mock_stringvar_instance.get = MagicMock(return_value="")
-        mock_stringvar_instance.set = MagicMock()
-
-        # Configure mock Style
-        mock_style_instance = mock_style.return_value
-        mock_style_instance.configure = MagicMock()
-        mock_style_instance.layout = MagicMock()
-
-        yield {
-            "tk": mock_tk_instance,
-            "style": mock_style_instance,
-            "notebook": mock_notebook,
-            "frame": mock_frame,
-            "stringvar": mock_stringvar,
-        }
-
-
-@pytest.mark.timeout(5)
-def test_profile_operations(mock_tk_setup):
-    """Test profile management operations."""
-    with patch("tkinter.ttk.Style", return_value=mock_tk_setup["style"]), patch(
-        "tkinter.StringVar", return_value=mock_tk_setup["stringvar"].return_value
-    ), patch("tkinter._default_root", mock_tk_setup["tk"]):
-
-        app = MainApp(mock_tk_setup["tk"])
-        app.profile_handler = MagicMock()  # Use profile_handler instead
-        app.profile_var = MagicMock()
-        app.profile_var.get.return_value = "test_profile"
-
-        # Test save profile
-        app.save_profile()
-        app.profile_handler.save_profile.assert_called_once_with(
-            "test_profile", {"products": []}
-        )
-
-
-def test_monitor_operations(root, app, mock_api, monkeypatch):
+def test_monitor_operations(root, app, gui_mocks, fake_tree, mock_api, monkeypatch):
     """Test monitoring operations (start, stop, pause)."""
-    # Mock necessary components
-    app.notebook = MagicMock()
-    app.product_tree = MagicMock()
-    app.monitor_tabs = {}
-    app.handle_error = MagicMock()
-
     # Mock interval entry
     app.interval_entry = MagicMock()
-    app.interval_entry.get = MagicMock(return_value="15")
+    app.interval_entry.get.return_value = "15"
 
     # Mock new_task_tab
     app.new_task_tab = MagicMock()
 
     # Test URL
-    url = "https://www.bestbuy.ca/en-ca/product/12345"
-    tab_name = f"Monitor_{url.split('/')[-1]}"
-
-    # Track created instances
-    created_monitors = []
-
-    # Create a more complete mock monitor
-    class MockMonitor:
-        def __init__(self, notebook, url, parent):
-            self.notebook = notebook
-            self.url = url
-            self.parent = parent
-            self.main_app = parent
-            self._start_monitoring = MagicMock()
-            self._stop_monitoring = MagicMock()
-            self.check_stock = MagicMock(return_value=(True, "Test Product", {}))
-            self.setup_ui = MagicMock()
-            self.validate_interval = MagicMock(return_value=15)
-            self.monitor_product = MagicMock()
-            self.scheduled_check = None
-            created_monitors.append(self)
-
-        def start_monitoring(self):
-            print("start_monitoring called")
-            try:
-                self.validate_interval()
-                self.monitor_product()
-                print("monitor_product called")
-            except Exception as e:
-                print(f"Error in start_monitoring: {e}")
-
-        def stop_monitoring(self):
-            print("stop_monitoring called")
-            if self.scheduled_check:
-                self.after_cancel(self.scheduled_check)
-            self._stop_monitoring()
-
-        def __str__(self):
-            return f"MockMonitor({self.url})"
-
-        def after(self, ms, func):
-            self.scheduled_check = func
-            return 1
-
-        def after_cancel(self, id):
-            self.scheduled_check = None
+    url = PRODUCT_URL
 
     # Mock ProductMonitor class
-    monkeypatch.setattr("reup.gui.main_window.ProductMonitor", MockMonitor)
-
-    # Mock notebook methods
-    def mock_add(widget, **kwargs):
-        # Don't trigger start_monitoring here, let main_window.py handle it
-        pass
-
-    app.notebook.add = MagicMock(side_effect=mock_add)
-    app.notebook.select = MagicMock()  # Add this to handle tab selection
-
-    # Mock tree methods
-    tree_items = {}
-
-    def mock_get_children():
-        return list(tree_items.keys())
-
-    def mock_item(item_id):
-        return {
-            "values": tree_items.get(
-                item_id, ["Test Product", url, "Not Monitoring", "▶", ""]
-            )
-        }
-
-    app.product_tree.get_children = MagicMock(side_effect=mock_get_children)
-    app.product_tree.item = MagicMock(side_effect=mock_item)
-    app.product_tree.set = MagicMock()
+    monkeypatch.setattr(_mw, "ProductMonitor", _make_monitor)
 
     # Add test item to tree
-    tree_items["item1"] = ["Test Product", url, "Not Monitoring", "▶", ""]
+    app.product_tree = fake_tree
+    fake_tree.insert("", "end", values=("Test Product", url, "Not Monitoring", "▶", ""))
 
     # Test start monitoring
     app.start_monitoring(url)
 
-    # Debug output
-    print(f"Monitor tabs: {app.monitor_tabs}")
-    print(f"Created monitors: {created_monitors}")
-    print(
-        f"Start monitoring called: {created_monitors[0].monitor_product.call_count if created_monitors else 'No monitors created'}"
-    )
-
-    assert tab_name in app.monitor_tabs
-    assert len(created_monitors) > 0
-    created_monitors[0].monitor_product.assert_called_once()
+    assert TAB_NAME in app.monitor_tabs
+    monitor = app.monitor_tabs[TAB_NAME]
+    assert monitor.url == url
+    monitor.start_monitoring.assert_called_once()
@@ -1,60 +1,37 @@
 import pytest
-import tkinter as tk
-from reup.gui.main_window import StockMonitorGUI
-from unittest.mock import MagicMock
-import time
+from tkinter import ttk
+import json
+import responses
+from reup.config.constants import API_URL
+from unittest.mock import Mock
 
+pytestmark = pytest.mark.gui
 
-@pytest.mark.timeout(10)  # Add timeout to prevent hanging
-def test_full_monitoring_cycle(root, app, mock_api, monkeypatch):
-    """Test a full monitoring cycle."""
-    # Mock necessary components
-    app.notebook = MagicMock()
-    app.product_tree = MagicMock()
-    app.monitor_tabs = {}
-    app.handle_error = MagicMock()
-    app.style = MagicMock()
-    app.log_message = MagicMock()
-
-    # Mock tree methods
-    app.product_tree.get_children = MagicMock(return_value=[])
-    app.product_tree.item = MagicMock(return_value={"values": ["", "", "", "", ""]})
-    app.product_tree.insert = MagicMock(return_value="item1")
 
-    # Mock notebook methods
-    app.notebook.select = MagicMock()
-    app.notebook.forget = MagicMock()
-    app.notebook.add = MagicMock()
-    app.notebook.index = MagicMock(return_value=1)
-    app.notebook.tab = MagicMock()
+def test_full_monitoring_cycle(mocked_app, mock_api, live_check_stock, http):
+    """Test a full monitoring cycle."""
+    app = mocked_app
 
     # Mock check_stock to simulate stock changes
     stock_status = {"available": False}
 
-    # Mock response object
-    class MockResponse:
-        def __init__(self, json_data, status_code=200):
-            self.json_data = json_data
-            self.status_code = status_code
-
-        def json(self):
-            return self.json_data
-
-    # Mock requests.get
-    def mock_requests_get(*args, **kwargs):
+    # Serve the availability endpoint, toggling stock on every request
+    def availability(request):
         stock_status["available"] = not stock_status["available"]  # Toggle availability
-        mock_data = mock_api["products"][0].copy()
-        mock_data["availability"]["isAvailableOnline"] = stock_status["available"]
-        mock_data["availability"]["onlineAvailability"] = (
-            "InStock" if stock_status["available"] else "OutOfStock"
-        )
-        mock_data["availability"]["onlineAvailabilityCount"] = (
-            5 if stock_status["available"] else 0
-        )
-        return MockResponse(mock_data)
-
-    # Apply mocks
-    monkeypatch.setattr("requests.get", mock_requests_get)
+        available = stock_status["available"]
+        product = mock_api["products"][0]
+        mock_data = {
+            "name": product["name"],
+            "availability": {
+                **product["availability"],
+                "isAvailableOnline": available,
+                "onlineAvailability": "InStock" if available else "OutOfStock",
+                "onlineAvailabilityCount": 5 if available else 0,
+            },
+        }
+        return 200, {}, json.dumps(mock_data)
+
+    http.add_callback(responses.GET, f"{API_URL}/12345/availability", availability)
 
     # Add test product
     url = "https://www.bestbuy.ca/en-ca/product/12345"
@@ -62,31 +39,33 @@ def test_full_monitoring_cycle(root, app, mock_api, monkeypatch):
     assert monitor is not None
 
     # Mock interval validation
-    monitor.interval_entry = MagicMock()
+    monitor.interval_entry = Mock(spec=ttk.Entry)
     monitor.interval_entry.get.return_value = "15"
 
-    # Mock the after method to execute immediately but prevent recursion
-    monitor.monitor_count = 0  # Add counter to prevent infinite recursion
-
-    def mock_after(ms, func, *args):
-        if monitor.monitor_count < 3 and not monitor.paused:  # Limit to 3 cycles
-            monitor.monitor_count += 1
-            func(*args)
-        return "after_id"
-
-    monitor.after = mock_after
-    monitor.after_cancel = MagicMock()
+    # Scheduling is a no-op; the test drives the check cycles itself
+    monitor.after = lambda ms, func=None, *args: "after_id"
+    monitor.after_cancel = Mock()
 
     # Start monitoring
     app.start_monitoring(url)
     tab_name = f"Monitor_{url.split('/')[-1]}"
     assert tab_name in app.monitor_tabs
 
-    # Run one monitoring cycle manually
-    monitor.monitor_product()
-
-    # Verify monitoring status
-    assert monitor.last_check_status is not None
+    # Run a few monitoring cycles, alternating stock availability
+    monitor.handle_stock_status = Mock(wraps=monitor.handle_stock_status)
+    calls_before = len(http.calls)  # add_product_to_monitor checked once already
+    for _ in range(3):
+        live_check_stock.cache_clear()  # Each cycle must reach the endpoint
+        monitor.monitor_product()
+
+    # One request per cycle, each seeing the toggled availability
+    assert len(http.calls) - calls_before == 3
+    seen = [
+        (c.args[2]["status"], c.args[2]["stock"])
+        for c in monitor.handle_stock_status.call_args_list
+    ]
+    assert seen == [("OutOfStock", 0), ("InStock", 5), ("OutOfStock", 0)]
+    assert monitor.last_check_status == "In Stock"
 
     # Test pause/resume
     monitor.toggle_pause()
@@ -2,14 +2,24 @@ import pytest
 from reup.managers.profile_manager import ProfileManager
 from reup.managers.search_manager import SearchManager
 from reup.utils.exceptions import ProfileLoadError, ProfileSaveError, APIError
-from unittest.mock import MagicMock
+import json
+import re
 import requests
-from unittest.mock import patch
 
+SEARCH_URL = re.compile(r"https://www\.bestbuy\.ca/api/v2/json/search\?.*")
 
-def test_profile_manager():
-    """Test profile management functionality."""
+
+@pytest.fixture(scope="module")
+def profile_manager(tmp_path_factory):
+    """One ProfileManager for the module, writing into a fresh temp dir."""
     manager = ProfileManager()
+    manager.profiles_dir = tmp_path_factory.mktemp("profiles")
+    return manager
+
+
+def test_profile_manager(profile_manager):
+    """Test profile management functionality."""
+    manager = profile_manager
 
     # Test profile save/load
     test_data = {
@@ -25,19 +35,38 @@ def test_profile_manager():
     assert loaded_data["products"] == test_data["products"]
     assert loaded_data["interval"] == test_data["interval"]
 
+    # List and delete profile
+    assert "test_profile" in manager.list_profiles()
+    assert manager.delete_profile("test_profile")
+    assert "test_profile" not in manager.list_profiles()
+    assert not manager.delete_profile("test_profile")
+
+
+def test_profile_manager_on_disk(profile_manager, disk_profiles):
+    """Test that profiles round-trip through real JSON files."""
+    test_data = {
+        "products": [{"url": "https://www.bestbuy.ca/en-ca/product/67890"}],
+        "interval": 30,
+    }
 
-def test_search_manager(mock_api, monkeypatch):
+    assert profile_manager.save_profile("disk_profile", test_data)
+    assert (profile_manager.profiles_dir / "disk_profile.json").is_file()
+
+    loaded_data = profile_manager.load_profile("disk_profile")
+    assert loaded_data["products"] == test_data["products"]
+    assert loaded_data["interval"] == test_data["interval"]
+
+    assert profile_manager.list_profiles() == ["disk_profile"]
+    assert profile_manager.delete_profile("disk_profile")
+    assert not (profile_manager.profiles_dir / "disk_profile.json").exists()
+
+
+def test_search_manager(mock_api, http):
     """Test product search functionality."""
     manager = SearchManager()
 
-    # Mock the API response
-    def mock_get(*args, **kwargs):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json = lambda: mock_api
-        return mock_response
-
-    monkeypatch.setattr("requests.get", mock_get)
+    # Mock the API response (mock_api is read-only, so serialize via dict)
+    http.get(SEARCH_URL, body=json.dumps(mock_api, default=dict))
 
     # Test search
     results = manager.search_products("Best Buy", "test query")
@@ -46,14 +75,11 @@ def test_search_manager(mock_api, monkeypatch):
     assert results[0]["price"] == float(mock_api["products"][0]["regularPrice"])
 
 
-def test_search_manager_operations():
+def test_search_manager_operations(http):
     """Test search manager operations."""
     search_manager = SearchManager()
+    http.get(SEARCH_URL, body=requests.exceptions.RequestException("Search error"))
 
-    def mock_error(*args, **kwargs):
-        raise requests.exceptions.RequestException("Search error")
-
-    with patch("requests.get", side_effect=mock_error):
-        with pytest.raises(APIError) as exc:
-            search_manager.search_products("Best Buy", "test")
-        assert "Search error" in str(exc.value)
+    with pytest.raises(APIError) as exc:
+        search_manager.search_products("Best Buy", "test")
+    assert "Search error" in str(exc.value)
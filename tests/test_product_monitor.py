@@ -1,16 +1,29 @@
+import copy
 import pytest
+import requests
+import responses
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 import tkinter as tk
 from tkinter import ttk
 from reup.core.product_monitor import ProductMonitor
 from reup.utils.exceptions import APIError, URLError
-from reup.config.constants import MIN_INTERVAL, DEFAULT_INTERVAL
-from reup.utils.helpers import get_timestamp
+from reup.utils.helpers import StockStatus
+from reup.config.constants import API_URL, MIN_INTERVAL, DEFAULT_INTERVAL
 from reup.core.base_monitor import BaseMonitor
 
+_STATUS_IN = {
+    "name": "Test Product",
+    "stock": 5,
+    "status": "InStock",
+    "purchasable": "Yes",
+}
+_STATUS_OUT = {**_STATUS_IN, "stock": 0, "status": "OutOfStock"}
+
 
 # ===== Fixtures =====
-@pytest.fixture
+# Built once per module; ``monitor`` resets the shared mocks for every test.
+@pytest.fixture(scope="module")
 def mock_tk():
     """Mock Tk and ttk to avoid actual window creation"""
     with patch("tkinter.Tk") as mock_tk, patch(
@@ -19,7 +32,7 @@ def mock_tk():
         yield {"tk": mock_tk, "notebook": mock_notebook, "frame": mock_frame}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_parent():
     """Create a mock parent with required attributes."""
     parent = MagicMock()
@@ -28,26 +41,44 @@ def mock_parent():
     return parent
 
 
-@pytest.fixture
-def monitor(mock_tk, mock_parent):
-    """Create a monitor instance with mocked components."""
+@pytest.fixture(scope="module")
+def _monitor_template(mock_tk, mock_parent):
+    """Construct the ProductMonitor that ``monitor`` copies for each test."""
     url = "https://www.bestbuy.ca/en-ca/product/12345"
     with patch("reup.core.product_monitor.ProductMonitor.setup_ui"):
         monitor = ProductMonitor(mock_tk["notebook"], url, mock_parent)
-        # Add tkinter-specific mocks
-        monitor.tk = mock_tk["tk"]
-        monitor.notebook = MagicMock()
-        monitor.notebook.tabs = MagicMock(return_value=["tab1"])
-        monitor.notebook.select = MagicMock(return_value="tab1")
-        monitor.notebook.tab = MagicMock()
+    # Nothing asserts on the Tcl interpreter, so a bare stub will do
+    monitor.tk = SimpleNamespace(call=lambda *args: None)
+    monitor.notebook = MagicMock()
 
-        # Mock other components
-        monitor.interval_entry = MagicMock(get=MagicMock(return_value="15"))
-        monitor.status_label = MagicMock()
-        monitor.log_display = MagicMock()
-        monitor.main_app = mock_parent
-        monitor._w = "test_widget"
-        return monitor
+    # Mock other components
+    monitor.interval_entry = MagicMock()
+    monitor.status_label = MagicMock()
+    monitor.log_display = MagicMock()
+    monitor.main_app = mock_parent
+    monitor._w = "test_widget"
+    return monitor
+
+
+@pytest.fixture
+def monitor(_monitor_template, mock_parent):
+    """Create a monitor instance with mocked components."""
+    template = _monitor_template
+    for mock in (
+        mock_parent,
+        template.notebook,
+        template.interval_entry,
+        template.status_label,
+        template.log_display,
+    ):
+        mock.reset_mock(return_value=True, side_effect=True)
+    template.notebook.tabs.return_value = ["tab1"]
+    template.notebook.select.return_value = "tab1"
+    template.interval_entry.get.return_value = "15"
+
+    monitor = copy.copy(template)
+    monitor.status = dict(template.status)
+    return monitor
 
 
 # ===== Test Classes =====
@@ -68,38 +99,43 @@ class TestBasicFunctionality:
         }
         assert isinstance(monitor.notebook, MagicMock)
 
-    def test_check_stock(self, monitor):
-        """Test stock checking functionality."""
-        with patch(
-            "reup.core.product_monitor.ProductMonitor.check_stock"
-        ) as mock_check:
-            # Test successful check
-            mock_check.return_value = (
-                True,
-                "Test Product",
-                {
-                    "name": "Test Product",
-                    "stock": 5,
-                    "status": "InStock",
-                    "purchasable": "Yes",
+    def test_check_stock(self, monitor, live_check_stock, http):
+        """Test stock checking against a stubbed availability endpoint."""
+        url = f"{API_URL}/12345/availability"
+
+        # Test successful check
+        http.get(
+            url,
+            json={
+                "name": "Test Product",
+                "availability": {
+                    "onlineAvailability": "InStock",
+                    "onlineAvailabilityCount": 5,
                 },
-            )
-            success, name, info = monitor.check_stock()
-            assert success is True
-            assert name == "Test Product"
-            assert info["stock"] == 5
-
-            # Test API error
-            mock_check.return_value = (False, None, None)
-            mock_check.side_effect = None
-            success, name, info = monitor.check_stock()
-            assert success is False
-            assert name is None
-            assert info is None
-
-    def test_validate_interval(self, monitor):
-        """Test interval validation including edge cases."""
-        test_cases = [
+            },
+        )
+        success, name, info = monitor.check_stock()
+        assert success is True
+        assert name == "Test Product"
+        assert info == StockStatus("InStock", 5)
+        assert monitor.last_check_status == "In Stock"
+
+        # Test API error
+        live_check_stock.cache_clear()
+        http.replace(
+            responses.GET,
+            url,
+            body=requests.exceptions.ConnectionError("Connection error"),
+        )
+        success, name, info = monitor.check_stock()
+        assert success is False
+        assert name is None
+        assert info is None
+        assert monitor.last_check_status.startswith("Error")
+
+    @pytest.mark.parametrize(
+        "interval,expected",
+        [
             ("15", 15),  # Valid interval
             ("", DEFAULT_INTERVAL),  # Empty string
             ("  ", DEFAULT_INTERVAL),  # Whitespace
@@ -109,29 +145,27 @@ class TestBasicFunctionality:
             ("0", MIN_INTERVAL),  # Zero
             ("2", MIN_INTERVAL),  # Below minimum
             ("100", 100),  # Above minimum
-        ]
-
-        for interval, expected in test_cases:
-            monitor.interval_entry.get.return_value = interval
-            assert (
-                monitor.validate_interval() == expected
-            ), f"Failed for input: {interval}"
+        ],
+    )
+    def test_validate_interval(self, monitor, interval, expected):
+        """Test interval validation including edge cases."""
+        monitor.interval_entry.get.return_value = interval
+        assert monitor.validate_interval() == expected
 
 
 class TestUIInteractions:
     """Tests for UI updates and user interactions"""
 
-    def test_setup_ui(self, monitor):
+    def test_setup_ui(self, monitor, mocker):
         """Test UI component setup."""
         monitor.tk = MagicMock()
-        with patch("tkinter.ttk.LabelFrame"), patch("tkinter.ttk.Frame"), patch(
-            "tkinter.ttk.Button"
-        ), patch("tkinter.ttk.Entry"), patch("tkinter.ttk.Label"), patch(
-            "tkinter.Text"
-        ):
-            monitor.setup_ui()
-            assert hasattr(monitor, "control_frame")
-            assert hasattr(monitor, "log_frame")
+        for widget in ("LabelFrame", "Frame", "Button", "Entry", "Label"):
+            mocker.patch(f"tkinter.ttk.{widget}")
+        mocker.patch("tkinter.Text")
+
+        monitor.setup_ui()
+        assert hasattr(monitor, "control_frame")
+        assert hasattr(monitor, "log_frame")
 
     def test_update_status_label(self, monitor):
         """Test status label updates including edge cases."""
@@ -148,44 +182,50 @@ class TestUIInteractions:
         monitor.status_label.config.assert_called_with(text="Status: InStock (5 units)")
         assert monitor.notebook.tab.called
 
-        # Test invalid data
-        invalid_data = [None, {}, {"status": None, "stock": "invalid"}]
-        for data in invalid_data:
-            monitor.update_status_label(data)
-            monitor.status_label.config.assert_called_with(
-                text="Status: Unknown (0 units)"
-            )
+    def test_log_status_stock_status(self, monitor):
+        """Test logging a check_stock result, which has no name or purchasable."""
+        monitor.log_message = MagicMock()
+
+        monitor.log_status(StockStatus("InStock", 5), "Test Product")
+
+        monitor.log_message.assert_called_once_with(
+            "📊 Stock Status:\nName: Test Product\nStock: 5 units\n"
+            "Status: InStock\nPurchasable: Unknown"
+        )
 
-    def test_notification(self, monitor):
+    @pytest.mark.parametrize("data", [None, {}, {"status": None, "stock": "invalid"}])
+    def test_update_status_label_invalid(self, monitor, data):
+        """Test status label fallback for missing or malformed data."""
+        monitor.update_status_label(data)
+        monitor.status_label.config.assert_called_with(text="Status: Unknown (0 units)")
+
+    def test_notification(self, monitor, mock_notify):
         """Test stock availability notifications."""
         monitor.log_message = MagicMock()
 
-        with patch("plyer.notification.notify") as mock_notify:
-            # Test successful notification
-            monitor.notify_stock_available("Test Product", 5)
-            mock_notify.assert_called_with(
-                title="Product In Stock!",
-                message="Test Product is now available!\n5 units in stock",
-                timeout=10,
-            )
+        # Test successful notification
+        monitor.notify_stock_available("Test Product", 5)
+        mock_notify.assert_called_with(
+            title="Product In Stock!",
+            message="Test Product is now available!\n5 units in stock",
+            timeout=10,
+        )
 
-            # Test notification failure
-            mock_notify.side_effect = Exception("OS notification failed")
-            monitor.notify_stock_available("Test Product", 5)
-            monitor.log_message.assert_called_with(
-                "⚠️ Could not send notification: OS notification failed"
-            )
+        # Test notification failure
+        mock_notify.side_effect = Exception("OS notification failed")
+        monitor.notify_stock_available("Test Product", 5)
+        monitor.log_message.assert_called_with(
+            "⚠️ Could not send notification: OS notification failed"
+        )
 
-    def test_log_message(self, monitor):
+    def test_log_message(self, monitor, frozen_timestamp):
         """Test logging functionality."""
-        timestamp = "2024-02-20 12:00:00"
-        with patch("reup.core.base_monitor.get_timestamp", return_value=timestamp):
-            test_message = "Test message"
-            expected_log = f"{timestamp} {test_message}\n"
-            monitor.log_message(test_message)
-            monitor.log_display.insert.assert_called_once_with("1.0", expected_log)
-            monitor.log_display.see.assert_called_once_with("1.0")
-            monitor.parent.log_message.assert_called_once_with(test_message)
+        test_message = "Test message"
+        expected_log = f"{frozen_timestamp} {test_message}\n"
+        monitor.log_message(test_message)
+        monitor.log_display.insert.assert_called_once_with("1.0", expected_log)
+        monitor.log_display.see.assert_called_once_with("1.0")
+        monitor.parent.log_message.assert_called_once_with(test_message)
 
 
 class TestLifecycle:
@@ -278,34 +318,30 @@ class TestErrorHandling:
 class TestEdgeCases:
     """Tests for edge cases and boundary conditions"""
 
-    def test_handle_stock_status(self, monitor):
+    @pytest.mark.parametrize(
+        "prev,available,details,notified",
+        [
+            (None, True, _STATUS_IN, True),  # First check, in stock
+            (True, True, _STATUS_IN, False),  # No change in status
+            (True, False, _STATUS_OUT, False),  # Available to unavailable
+            (False, True, _STATUS_IN, True),  # Back in stock
+        ],
+    )
+    def test_handle_stock_status(self, monitor, prev, available, details, notified):
         """Test stock status handling including edge cases."""
         monitor.log_status = MagicMock()
         monitor.update_status_label = MagicMock()
         monitor.notify_stock_available = MagicMock()
+        monitor.status["last_status"] = prev
 
-        status_details = {
-            "name": "Test Product",
-            "stock": 5,
-            "status": "InStock",
-            "purchasable": "Yes",
-        }
+        monitor.handle_stock_status(available, "Test Product", details)
 
-        # Test first check (no previous status)
-        monitor.handle_stock_status(True, "Test Product", status_details)
-        monitor.log_status.assert_called_with(status_details)
-        monitor.update_status_label.assert_called_with(status_details)
-        monitor.notify_stock_available.assert_called_with("Test Product", 5)
-
-        # Test no change in status
-        monitor.notify_stock_available.reset_mock()
-        monitor.handle_stock_status(True, "Test Product", status_details)
-        monitor.notify_stock_available.assert_not_called()
-
-        # Test status change from available to unavailable
-        monitor.notify_stock_available.reset_mock()
-        monitor.handle_stock_status(
-            False, "Test Product", {**status_details, "stock": 0}
-        )
-        assert monitor.status["last_status"] is False
-        monitor.notify_stock_available.assert_not_called()
+        monitor.log_status.assert_called_with(details, "Test Product")
+        monitor.update_status_label.assert_called_with(details)
+        assert monitor.status["last_status"] is available
+        if notified:
+            monitor.notify_stock_available.assert_called_once_with(
+                "Test Product", details["stock"]
+            )
+        else:
+            monitor.notify_stock_available.assert_not_called()
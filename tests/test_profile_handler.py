@@ -1,14 +1,34 @@
 """Tests for profile management logic."""
 
+import os
+import shutil
+import tempfile
 import pytest
 from pathlib import Path
 from reup.managers.profile_handler import ProfileHandler
 
 
+@pytest.fixture(scope="session")
+def _profiles_root(tmp_path_factory):
+    """Temporary directory holding one profiles subdirectory per test.
+
+    On Linux this lives on the /dev/shm tmpfs so profile I/O stays in memory.
+    """
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        root = Path(tempfile.mkdtemp(prefix="reup-profiles-", dir=shm))
+        yield root
+        shutil.rmtree(root, ignore_errors=True)
+    else:
+        yield tmp_path_factory.mktemp("profiles_root")
+
+
 @pytest.fixture
-def profile_handler(tmp_path):
-    """Create ProfileHandler with temporary directory."""
-    return ProfileHandler(profiles_dir=tmp_path)
+def profile_handler(_profiles_root, request):
+    """Create ProfileHandler with its own temporary directory."""
+    profiles_dir = _profiles_root / request.node.name
+    profiles_dir.mkdir()
+    return ProfileHandler(profiles_dir=profiles_dir)
 
 
 def test_save_and_load_profile(profile_handler):
@@ -36,7 +56,7 @@ def test_list_profiles(profile_handler):
 
     # List and verify
     available_profiles = profile_handler.list_profiles()
-    assert sorted(available_profiles) == sorted(profiles.keys())
+    assert set(available_profiles) == set(profiles)
 
 
 def test_delete_profile(profile_handler):
@@ -0,0 +1,66 @@
+import pytest
+from unittest.mock import MagicMock, call
+from reup.core import task_monitor as _task_monitor
+from reup.core.task_monitor import TaskMonitor
+from reup.utils.exceptions import APIError
+from reup.utils.helpers import StockStatus
+
+PRODUCT_IDS = ["111", "222", "333"]
+URLS = [f"https://www.bestbuy.ca/en-ca/product/{pid}" for pid in PRODUCT_IDS]
+
+
+@pytest.fixture
+def task_monitor():
+    """TaskMonitor with a fake product tree and no widgets."""
+    rows = {
+        f"I{i}": ("Loading...", url, "Best Buy CA", "Monitoring", "⏸", "🗑")
+        for i, url in enumerate(URLS)
+    }
+    monitor = TaskMonitor.__new__(TaskMonitor)
+    monitor.paused = False
+    monitor.product_tree = MagicMock()
+    monitor.product_tree.get_children.return_value = list(rows)
+    monitor.product_tree.item.side_effect = lambda item, **kwargs: (
+        None if kwargs else {"values": rows[item]}
+    )
+    monitor.log_message = MagicMock()
+    monitor.validate_interval = MagicMock(return_value=15)
+    monitor.after = MagicMock(return_value="after_id")
+    return monitor
+
+
+def test_monitor_products_outcomes(task_monitor, monkeypatch):
+    """Test each check outcome updates its own row, in input order."""
+    check_stock_many = MagicMock(
+        return_value=[
+            (True, "First Product", StockStatus("InStock", 3)),
+            APIError("Service unavailable"),
+            ("malformed",),
+        ]
+    )
+    monkeypatch.setattr(_task_monitor, "check_stock_many", check_stock_many)
+
+    task_monitor.monitor_products()
+
+    check_stock_many.assert_called_once_with(PRODUCT_IDS)
+    updates = [c for c in task_monitor.product_tree.item.call_args_list if c.kwargs]
+    assert updates == [
+        call(
+            "I0",
+            values=("First Product", URLS[0], "Best Buy CA", "Monitoring", "⏸", "🗑"),
+        ),
+        call("I1", values=("Error", URLS[1], "Best Buy CA", "Monitoring", "⏸", "🗑")),
+        call("I2", values=("Error", URLS[2], "Best Buy CA", "Monitoring", "⏸", "🗑")),
+    ]
+    assert task_monitor.log_message.call_args_list == [
+        *(call(f"Checking product: {url}") for url in URLS),
+        call("📊 Updated First Product: Monitoring"),
+        call(f"❌ Error checking {URLS[1]}: Service unavailable"),
+        call("📊 Updated Error: Monitoring"),
+        call(
+            f"❌ Error checking {URLS[2]}: "
+            "not enough values to unpack (expected 3, got 1)"
+        ),
+        call("📊 Updated Error: Monitoring"),
+    ]
+    task_monitor.after.assert_called_once_with(15000, task_monitor.monitor_products)
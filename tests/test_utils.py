@@ -1,8 +1,28 @@
 import pytest
-from reup.utils.helpers import check_stock, parse_url
+from dataclasses import FrozenInstanceError
+from reup.utils.helpers import (
+    StockStatus,
+    check_stock,
+    check_stock_many,
+    create_session,
+    load_profile,
+    parse_url,
+    save_profile,
+)
 from reup.utils.exceptions import URLError, APIError, URLParseError
+import copy
+import json
+import pickle
+import shutil
 import requests
-from reup.config.constants import API_URL
+import threading
+import time
+from concurrent.futures import Future
+from unittest.mock import MagicMock, call
+import responses
+from responses import matchers
+from reup.utils import helpers
+from reup.config.constants import API_URL, USER_AGENT
 
 
 def test_url_parsing():
@@ -21,29 +41,90 @@ def test_url_parsing():
         parse_url("https://www.bestbuy.ca/en-ca/product/")
     assert str(exc_info.value) == "Could not extract product ID: No product ID found"
 
+    # Test non-string input
+    for bad in (123, None):
+        with pytest.raises(URLParseError):
+            parse_url(bad)
 
-def test_stock_checking(mock_api, monkeypatch):
+
+def test_url_parsing_cache(monkeypatch):
+    """Test repeat lookups of the same URL are served from the cache."""
+    url = "https://www.bestbuy.ca/en-ca/product/24680"
+    log_event = MagicMock()
+    monkeypatch.setattr(helpers, "log_security_event", log_event)
+    parse_url.cache_clear()
+
+    assert parse_url(url) == "24680"
+    assert parse_url(url) == "24680"
+    assert parse_url.cache_info().hits == 1
+
+    # The audit event is still written for every lookup
+    assert log_event.call_args_list == 2 * [
+        call("URL_PARSE", "Successfully extracted product ID: 24680")
+    ]
+
+    # Failures are re-raised every time rather than cached
+    for _ in range(2):
+        with pytest.raises(URLParseError):
+            parse_url("invalid_url")
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://www.bestbuy.ca/en-ca/product/12345/", "12345"),
+        ("https://www.bestbuy.ca/fr-ca/category/product/67890", "67890"),
+        ("https://www.bestbuy.ca/product/12345", None),
+        ("https://www.bestbuy.ca/en-ca/category/12345", None),
+    ],
+)
+def test_url_parsing_paths(url, expected):
+    """Test product ID extraction across URL path shapes."""
+    if expected is None:
+        with pytest.raises(URLParseError):
+            parse_url(url)
+    else:
+        assert parse_url(url) == expected
+
+
+def test_profile_file_round_trip(tmp_path):
+    """Test saving a profile into a new directory and loading it back."""
+    filename = str(tmp_path / "profiles" / "test_profile.json")
+    profile_data = {"products": [{"url": "https://www.bestbuy.ca/en-ca/product/1"}]}
+
+    assert save_profile(filename, profile_data)
+    assert save_profile(filename, profile_data)  # Directory already exists
+
+    # A directory removed after the first save is created again
+    shutil.rmtree(tmp_path / "profiles")
+    assert save_profile(filename, profile_data)
+    assert load_profile(filename) == profile_data
+    assert load_profile(str(tmp_path / "missing.json")) is None
+    assert not save_profile(filename, {"products": {object()}})
+
+
+def test_get_timestamp(monkeypatch):
+    """Test the timestamp matches the standard strftime layout."""
+    fixed = time.struct_time((2024, 2, 5, 9, 3, 7, 0, 36, 0))
+    monkeypatch.setattr(helpers.time, "localtime", lambda: fixed)
+
+    assert helpers.get_timestamp() == time.strftime("%Y-%m-%d %H:%M:%S", fixed)
+    assert helpers.get_timestamp() == "2024-02-05 09:03:07"
+
+
+def test_stock_checking(mock_api, http):
     """Test stock checking functionality."""
+    url = f"{API_URL}/12345/availability"
 
-    # Create a proper mock Response class
-    class MockResponse:
-        def __init__(self, status_code, json_data, raise_error=False):
-            self.status_code = status_code
-            self._json_data = json_data
-            self.text = str(json_data)
-            self._raise_error = raise_error
-
-        def json(self):
-            return self._json_data
-
-        def raise_for_status(self):
-            if self._raise_error or self.status_code >= 400:
-                raise requests.exceptions.HTTPError(f"{self.status_code} Error")
-
-    # Test successful case
-    success_response = MockResponse(
-        status_code=200,
-        json_data={
+    # Test successful case, sent with the session's default headers
+    http.get(
+        url,
+        match=[
+            matchers.header_matcher(
+                {"User-Agent": USER_AGENT, "Accept": "application/json"}
+            )
+        ],
+        json={
             "name": mock_api["products"][0]["name"],
             "availability": {
                 "onlineAvailability": "InStock",
@@ -52,37 +133,218 @@ def test_stock_checking(mock_api, monkeypatch):
         },
     )
 
-    def mock_get_success(*args, **kwargs):
-        return success_response
-
-    monkeypatch.setattr("requests.get", mock_get_success)
-
     success, name, info = check_stock("12345")
     assert success
     assert name == mock_api["products"][0]["name"]
-    assert info["status"] == "InStock"
-    assert info["stock"] == 5
+    assert info.status == "InStock"
+    assert info.stock == 5
+    assert info["stock"] == info.get("stock") == 5
+    assert info.asdict() == {"status": "InStock", "stock": 5}
 
     # Test connection error case
-    def mock_connection_error(*args, **kwargs):
-        raise requests.exceptions.ConnectionError("Connection error")
-
-    monkeypatch.setattr("requests.get", mock_connection_error)
+    check_stock.cache_clear()
+    http.replace(
+        responses.GET,
+        url,
+        body=requests.exceptions.ConnectionError("Connection error"),
+    )
 
     with pytest.raises(APIError) as exc:
         check_stock("12345")
     assert "Connection error" in str(exc.value)
 
     # Test HTTP error case
-    error_response = MockResponse(
-        status_code=404, json_data={"error": "Not found"}, raise_error=True
-    )
+    http.replace(responses.GET, url, json={"error": "Not found"}, status=404)
 
-    def mock_http_error(*args, **kwargs):
-        return error_response
+    with pytest.raises(APIError) as exc:
+        check_stock("12345")
+    assert "404" in str(exc.value)
+
+    # Test undecodable body
+    http.replace(responses.GET, url, body="<html>Service Unavailable</html>")
+
+    with pytest.raises(APIError):
+        check_stock("12345")
 
-    monkeypatch.setattr("requests.get", mock_http_error)
+    # Test payload missing the availability fields
+    http.replace(responses.GET, url, json={"name": "Test Product"})
 
     with pytest.raises(APIError) as exc:
         check_stock("12345")
-    assert "404" in str(exc.value)
+    assert "availability" in str(exc.value)
+
+
+def test_stock_session_policy():
+    """Test the stock-check session follows create_session's HTTP policy."""
+    shared = helpers._SESSION.get_adapter(API_URL)
+    default = create_session().get_adapter(API_URL)
+
+    for attr in ("total", "backoff_factor", "status_forcelist", "allowed_methods"):
+        assert getattr(shared.max_retries, attr) == getattr(default.max_retries, attr)
+    assert shared._pool_maxsize == 32
+    assert helpers._SESSION.headers["Accept"] == "application/json"
+    assert helpers._SESSION.headers["User-Agent"] == USER_AGENT
+
+
+def test_check_stock_cache(mock_api, http):
+    """Test that repeated checks of one product share a request until cleared."""
+    http.get(
+        f"{API_URL}/12345/availability",
+        json={
+            "name": mock_api["products"][0]["name"],
+            "availability": {
+                "onlineAvailability": "InStock",
+                "onlineAvailabilityCount": 5,
+            },
+        },
+    )
+
+    first = check_stock("12345")
+    with pytest.raises(FrozenInstanceError):
+        first[2].stock = 0  # Callers must not be able to corrupt the cache
+    assert check_stock("12345") is first
+    assert first == (
+        True,
+        mock_api["products"][0]["name"],
+        StockStatus("InStock", 5),
+    )
+    assert len(http.calls) == 1
+
+    check_stock.cache_clear()
+    check_stock("12345")
+    assert len(http.calls) == 2
+
+    # Override headers bypass the cache and are sent
+    http.get(
+        f"{API_URL}/12345/availability",
+        match=[matchers.header_matcher({"X-Test": "1"})],
+        json={"name": "Override", "availability": {"onlineAvailability": "InStock"}},
+    )
+    assert check_stock("12345", {"X-Test": "1"})[1] == "Override"
+    assert len(http.calls) == 3
+
+
+def test_check_stock_cache_bounds(http, monkeypatch):
+    """Test the caches evict their oldest products and drop expired entries."""
+    monkeypatch.setattr(helpers, "STOCK_CACHE_MAXSIZE", 2)
+    for product_id in ("1", "2", "3"):
+        http.get(
+            f"{API_URL}/{product_id}/availability",
+            headers={"ETag": f'"{product_id}"'},
+            json={"name": product_id, "availability": {"onlineAvailability": "x"}},
+        )
+        check_stock(product_id)
+
+    assert list(helpers._stock_cache) == ["2", "3"]
+    assert list(helpers._etag_cache) == ["2", "3"]
+
+    # An expired entry is removed when looked up, even if the refetch fails
+    monkeypatch.setattr(helpers, "STOCK_CACHE_TTL", 0)
+    http.replace(responses.GET, f"{API_URL}/3/availability", status=404)
+    with pytest.raises(APIError):
+        check_stock("3")
+    assert list(helpers._stock_cache) == ["2"]
+
+
+def test_stock_status_copy_and_pickle():
+    """Test StockStatus survives copy, deepcopy and a pickle round trip."""
+    info = StockStatus("InStock", 5)
+
+    for clone in (
+        copy.copy(info),
+        copy.deepcopy(info),
+        pickle.loads(pickle.dumps(info)),
+    ):
+        assert clone == info
+        assert clone["stock"] == 5
+        with pytest.raises(FrozenInstanceError):
+            clone.stock = 0
+
+
+def test_check_stock_coalesces_inflight(mock_api, http, monkeypatch):
+    """Test that concurrent checks of one product share a single request."""
+    monkeypatch.setattr(helpers, "STOCK_CACHE_TTL", 0)  # Only coalescing helps
+    started, waiting, release = (threading.Event() for _ in range(3))
+
+    class _Future(Future):
+        def result(self, timeout=None):
+            waiting.set()
+            return super().result(timeout)
+
+    monkeypatch.setattr(helpers, "Future", _Future)
+
+    def availability(request):
+        started.set()
+        release.wait(5)
+        body = {
+            "name": mock_api["products"][0]["name"],
+            "availability": {"onlineAvailability": "InStock"},
+        }
+        return 200, {}, json.dumps(body)
+
+    http.add_callback(responses.GET, f"{API_URL}/12345/availability", availability)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(check_stock("12345")))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+    assert waiting.wait(5)  # Second caller is blocked on the first's request
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(results) == 2
+    assert results[0] is results[1]
+    assert len(http.calls) == 1
+
+
+def test_check_stock_conditional_get(mock_api, http, monkeypatch):
+    """Test that a 304 reply reuses the result stored with the ETag."""
+    monkeypatch.setattr(helpers, "STOCK_CACHE_TTL", 0)  # Always go to the API
+    url = f"{API_URL}/12345/availability"
+    http.get(
+        url,
+        json={
+            "name": mock_api["products"][0]["name"],
+            "availability": {
+                "onlineAvailability": "InStock",
+                "onlineAvailabilityCount": 5,
+            },
+        },
+        headers={"ETag": '"v1"'},
+    )
+    first = check_stock("12345")
+
+    http.replace(
+        responses.GET,
+        url,
+        status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"v1"'})],
+    )
+    assert check_stock("12345") == first
+    assert len(http.calls) == 2
+
+
+def test_check_stock_many(live_check_stock, http):
+    """Test concurrent stock checks keep input order and capture failures."""
+    http.get(
+        f"{API_URL}/111/availability",
+        json={
+            "name": "First Product",
+            "availability": {
+                "onlineAvailability": "InStock",
+                "onlineAvailabilityCount": 2,
+            },
+        },
+    )
+    http.get(f"{API_URL}/222/availability", status=404)
+
+    assert check_stock_many([]) == []
+
+    first, second = check_stock_many(["111", "222"])
+    assert first == (True, "First Product", StockStatus("InStock", 2))
+    assert isinstance(second, APIError)